@@ -5,61 +5,267 @@ Similar to Spring Boot Actuator
 import os
 import sys
 import platform
+import re
+import threading
 import time
+from collections import namedtuple
 from datetime import datetime
-from flask import jsonify
+import orjson
+from flask import Response
 import psutil
+from .responses import cached_json_response, etag_for, json_response
+
+# Env var names that may hold credentials and are hidden from /actuator/env
+SECRET_RE = re.compile(r'password|secret|key|token|credential|auth', re.IGNORECASE)
+
+# The image sets BUILD_TIME (possibly empty); otherwise report when we started
+_BUILD_TIME = os.getenv('BUILD_TIME') or datetime.now().isoformat()
+
+# Liveness only reports that the process can serve requests
+LIVENESS_BODY = b'{"status":"UP"}'
+
+# Seconds a computed /actuator/health result is reused before re-checking
+HEALTH_CACHE_TTL = float(os.getenv('HEALTH_CACHE_TTL', '5'))
+
+# Seconds between background samples served by /actuator/metrics; at least
+# one second so a 0 can't turn the sampler into a busy loop
+METRICS_SAMPLE_INTERVAL = max(float(os.getenv('METRICS_SAMPLE_INTERVAL', '5')), 1.0)
+
+# One sampler tick's worth of system readings, shared by health and metrics.
+# error is set instead of the readings when sampling failed; cpu_percent is
+# None until the sampler thread has a baseline to measure against.
+SystemSnapshot = namedtuple('SystemSnapshot', ['cpu_percent', 'memory', 'disk', 'error'])
+
+# Field-compatible subsets of psutil's svmem and sdiskusage
+MemoryUsage = namedtuple('MemoryUsage', ['total', 'available', 'percent'])
+DiskUsage = namedtuple('DiskUsage', ['total', 'used', 'free'])
+
+def read_disk_usage(path='/'):
+    """Disk usage for path from a single statvfs call"""
+    st = os.statvfs(path)
+    total = st.f_blocks * st.f_frsize
+    # Same accounting as psutil: used excludes reserved blocks, free is what
+    # an unprivileged user can still write
+    used = (st.f_blocks - st.f_bfree) * st.f_frsize
+    free = st.f_bavail * st.f_frsize
+    return DiskUsage(total, used, free)
+
+def psutil_memory_usage():
+    """Memory usage via psutil, for hosts where /proc/meminfo can't be used"""
+    memory = psutil.virtual_memory()
+    return MemoryUsage(memory.total, memory.available, memory.percent)
+
+class MeminfoReader:
+    """Reads MemTotal/MemAvailable from /proc/meminfo into a reused buffer"""
+    def __init__(self, path='/proc/meminfo'):
+        # Kept open for the sampler's lifetime; pread never moves a shared offset,
+        # so forked workers can keep using the inherited fd
+        self._fd = os.open(path, os.O_RDONLY)
+        self._buf = bytearray(4096)
+    
+    def read(self):
+        """Return a MemoryUsage for the current contents of /proc/meminfo"""
+        size = os.preadv(self._fd, [self._buf], 0)
+        while size == len(self._buf):
+            # The file didn't fit; grow the buffer and read it again
+            self._buf = bytearray(len(self._buf) * 2)
+            size = os.preadv(self._fd, [self._buf], 0)
+        total = self._field(b'MemTotal:', size)
+        available = self._field(b'MemAvailable:', size)
+        if total is None or available is None:
+            # Kernels before 3.14 have no MemAvailable; psutil estimates it
+            return psutil_memory_usage()
+        percent = round((total - available) / total * 100, 1)
+        return MemoryUsage(total, available, percent)
+    
+    def close(self):
+        """Close the /proc/meminfo fd"""
+        os.close(self._fd)
+    
+    def _field(self, name, size):
+        """Parse one "Name:   <n> kB" line in place, returning the value in bytes"""
+        start = self._buf.find(name, 0, size)
+        if start < 0:
+            return None
+        start += len(name)
+        end = self._buf.find(b' kB', start, size)
+        # Copies just the padded number (a few bytes); int() ignores the padding
+        return int(self._buf[start:end]) * 1024
 
 class FlaskActuator:
     def __init__(self, app=None):
         self.app = app
         self.start_time = time.time()
+        # Env-driven config
+        self._app_name = os.getenv('APP_NAME', 'flask-web')
+        self._app_version = os.getenv('APP_VERSION', '1.0.0')
+        self._environment = os.getenv('ENVIRONMENT', 'development')
+        self._git_branch = os.getenv('GIT_BRANCH', 'unknown')
+        self._git_commit_id = os.getenv('GIT_COMMIT_HASH', 'unknown')
+        self._git_commit_time = os.getenv('GIT_COMMIT_TIME', 'unknown')
+        self._flask_debug = os.getenv('FLASK_DEBUG', 'False')
+        self._flask_testing = os.getenv('FLASK_TESTING', 'False')
+        self._port = os.getenv('PORT', '8080')
+        self._host = os.getenv('HOST', '0.0.0.0')
+        # (expiry, body, status) of the last health check, shared by worker threads
+        self._health_cache = (0.0, None, None)
+        self._health_lock = threading.Lock()
+        # Latest SystemSnapshot; replaced wholesale by the sampler thread
+        self._snapshot = None
+        self._sampler_pid = None
+        self._sampler_thread = None
+        self._sampler_lock = threading.Lock()
+        self._sampler_stop = threading.Event()
+        try:
+            self._meminfo = MeminfoReader()
+        except OSError:
+            # No /proc off Linux (e.g. local development on macOS)
+            self._meminfo = None
+        # Info body split around the uptime placeholder; quotes inside string
+        # values are escaped, so the placeholder can only match the key
+        self._info_prefix, self._info_suffix = orjson.dumps(self._build_info_static()).split(b'"uptime":""', 1)
+        self._env_body = orjson.dumps(self._build_env())
+        self._env_etag = etag_for(self._env_body)
         if app is not None:
             self.init_app(app)
     
     def init_app(self, app):
         """Initialize the actuator with Flask app"""
         self.app = app
+        app.extensions['actuator'] = self
         self.register_endpoints()
+        # Seed memory and disk readings without starting a thread, so a preloaded
+        # gunicorn master never forks with a sampler running. CPU usage needs a
+        # per-thread baseline, so it stays None until the sampler's first tick.
+        self._take_sample(sample_cpu=False)
+    
+    def ensure_sampler(self):
+        """Start the metrics sampler thread if this process doesn't have one yet"""
+        # gunicorn workers start it from post_fork in gunicorn.conf.py; other
+        # hosts (flask run, test clients) start it on the first snapshot read
+        if self._sampler_pid == os.getpid():
+            return
+        with self._sampler_lock:
+            if self._sampler_pid == os.getpid():
+                return
+            self._sampler_thread = threading.Thread(target=self._sample_loop, name='actuator-sampler', daemon=True)
+            self._sampler_thread.start()
+            self._sampler_pid = os.getpid()
+    
+    def _sample_loop(self):
+        """Refresh the system snapshot every METRICS_SAMPLE_INTERVAL seconds"""
+        # psutil keeps the cpu_percent baseline per thread, so prime it here for
+        # the first tick to report usage over a full interval
+        psutil.cpu_percent(interval=None)
+        while not self._sampler_stop.wait(METRICS_SAMPLE_INTERVAL):
+            self._take_sample()
+    
+    def close(self):
+        """Stop the sampler thread and release the /proc/meminfo fd"""
+        self._sampler_stop.set()
+        # Wait for an in-flight sample so the fd isn't closed under it
+        if self._sampler_thread is not None and self._sampler_pid == os.getpid():
+            self._sampler_thread.join()
+        if self._meminfo is not None:
+            self._meminfo.close()
+            self._meminfo = None
+    
+    def _take_sample(self, sample_cpu=True):
+        """Collect CPU, memory and disk usage into a new snapshot"""
+        try:
+            cpu_percent = None
+            if sample_cpu:
+                # Non-blocking: usage since this thread's previous call
+                cpu_percent = psutil.cpu_percent(interval=None)
+            self._snapshot = SystemSnapshot(
+                cpu_percent=cpu_percent,
+                memory=self._read_memory(),
+                disk=read_disk_usage('/'),
+                error=None
+            )
+        except Exception as e:
+            self._snapshot = SystemSnapshot(None, None, None, str(e))
+    
+    def _read_memory(self):
+        """Memory usage from /proc/meminfo, falling back to psutil off Linux"""
+        if self._meminfo is not None:
+            return self._meminfo.read()
+        return psutil_memory_usage()
+    
+    def _get_snapshot(self):
+        """Return the latest system snapshot, raising if sampling failed"""
+        self.ensure_sampler()
+        snapshot = self._snapshot
+        if snapshot.error is not None:
+            raise RuntimeError(snapshot.error)
+        return snapshot
     
     def register_endpoints(self):
         """Register all actuator endpoints"""
-        self.app.add_url_rule('/actuator', 'actuator_index', self.actuator_index)
-        self.app.add_url_rule('/actuator/health', 'actuator_health', self.health)
-        self.app.add_url_rule('/actuator/info', 'actuator_info', self.info)
-        self.app.add_url_rule('/actuator/metrics', 'actuator_metrics', self.metrics)
-        self.app.add_url_rule('/actuator/env', 'actuator_env', self.env)
-        self.app.add_url_rule('/actuator/configprops', 'actuator_configprops', self.configprops)
-    
-    def actuator_index(self):
-        """List all available actuator endpoints"""
-        return jsonify({
+        self._index_body = orjson.dumps({
             "_links": {
                 "self": {"href": "/actuator"},
                 "health": {"href": "/actuator/health"},
+                "liveness": {"href": "/actuator/health/liveness"},
+                "readiness": {"href": "/actuator/health/readiness"},
                 "info": {"href": "/actuator/info"},
                 "metrics": {"href": "/actuator/metrics"},
                 "env": {"href": "/actuator/env"},
                 "configprops": {"href": "/actuator/configprops"}
             }
         })
+        self._configprops_body = orjson.dumps(self._build_configprops())
+        self._index_etag = etag_for(self._index_body)
+        self._configprops_etag = etag_for(self._configprops_body)
+        
+        self.app.add_url_rule('/actuator', 'actuator_index', self.actuator_index)
+        self.app.add_url_rule('/actuator/health', 'actuator_health', self.health)
+        self.app.add_url_rule('/actuator/health/liveness', 'actuator_liveness', self.liveness)
+        self.app.add_url_rule('/actuator/health/readiness', 'actuator_readiness', self.health)
+        self.app.add_url_rule('/actuator/info', 'actuator_info', self.info)
+        self.app.add_url_rule('/actuator/metrics', 'actuator_metrics', self.metrics)
+        self.app.add_url_rule('/actuator/env', 'actuator_env', self.env)
+        self.app.add_url_rule('/actuator/configprops', 'actuator_configprops', self.configprops)
+    
+    def actuator_index(self):
+        """List all available actuator endpoints"""
+        return cached_json_response(self._index_body, self._index_etag)
+    
+    def liveness(self):
+        """Liveness probe; constant so it never runs the system checks"""
+        return Response(LIVENESS_BODY, mimetype='application/json')
     
     def health(self):
-        """Health check endpoint"""
+        """Health check endpoint, also served as the readiness probe (cached for HEALTH_CACHE_TTL seconds)"""
+        expiry, body, status = self._health_cache
+        if time.monotonic() >= expiry:
+            with self._health_lock:
+                expiry, body, status = self._health_cache
+                # Another thread may have refreshed the cache while we waited
+                if time.monotonic() >= expiry:
+                    payload, status = self._check_health()
+                    body = orjson.dumps(payload)
+                    self._health_cache = (time.monotonic() + HEALTH_CACHE_TTL, body, status)
+        return Response(body, status=status, mimetype='application/json')
+    
+    def _check_health(self):
+        """Run the disk and memory checks, returning (payload, status code)"""
         try:
+            snapshot = self._get_snapshot()
+            
             # Check disk space
-            disk_usage = psutil.disk_usage('/')
+            disk_usage = snapshot.disk
             disk_free_percent = (disk_usage.free / disk_usage.total) * 100
             disk_status = "UP" if disk_free_percent > 10 else "DOWN"
             
             # Check memory
-            memory = psutil.virtual_memory()
+            memory = snapshot.memory
             memory_status = "UP" if memory.percent < 90 else "DOWN"
             
             # Overall status
             overall_status = "UP" if disk_status == "UP" and memory_status == "UP" else "DOWN"
             
-            return jsonify({
+            return {
                 "status": overall_status,
                 "components": {
                     "diskSpace": {
@@ -83,39 +289,37 @@ class FlaskActuator:
                         "status": "UP"
                     }
                 }
-            })
+            }, 200
         except Exception as e:
-            return jsonify({
+            return {
                 "status": "DOWN",
                 "details": {"error": str(e)}
-            }), 503
+            }, 503
     
-    def info(self):
-        """Application information"""
-        uptime_seconds = int(time.time() - self.start_time)
-        
-        return jsonify({
+    def _build_info_static(self):
+        """Build the info payload with an empty uptime placeholder"""
+        return {
             "app": {
-                "name": os.getenv('APP_NAME', 'flask-web'),
-                "version": os.getenv('APP_VERSION', '1.0.0'),
+                "name": self._app_name,
+                "version": self._app_version,
                 "description": "Flask Web Application with Actuator",
-                "uptime": f"{uptime_seconds}s"
+                "uptime": ""
             },
             "build": {
-                "version": os.getenv('APP_VERSION', '1.0.0'),
-                "artifact": os.getenv('APP_NAME', 'flask-web'),
-                "name": os.getenv('APP_NAME', 'flask-web'),
-                "time": os.getenv('BUILD_TIME', datetime.now().isoformat()),
+                "version": self._app_version,
+                "artifact": self._app_name,
+                "name": self._app_name,
+                "time": _BUILD_TIME,
                 "group": "demo-apps"
             },
             "git": {
-                "branch": os.getenv('GIT_BRANCH', 'unknown'),
+                "branch": self._git_branch,
                 "commit": {
-                    "id": os.getenv('GIT_COMMIT_HASH', 'unknown'),
-                    "time": os.getenv('GIT_COMMIT_TIME', 'unknown')
+                    "id": self._git_commit_id,
+                    "time": self._git_commit_time
                 }
             },
-            "environment": os.getenv('ENVIRONMENT', 'development'),
+            "environment": self._environment,
             "python": {
                 "version": sys.version,
                 "implementation": platform.python_implementation(),
@@ -131,16 +335,24 @@ class FlaskActuator:
                 "arch": platform.machine(),
                 "processor": platform.processor()
             }
-        })
+        }
+    
+    def info(self):
+        """Application information"""
+        uptime_seconds = int(time.time() - self.start_time)
+        
+        body = b'%s"uptime":"%ds"%s' % (self._info_prefix, uptime_seconds, self._info_suffix)
+        return Response(body, mimetype='application/json')
     
     def metrics(self):
-        """System metrics"""
+        """System metrics, served from the latest background sample"""
         try:
-            cpu_percent = psutil.cpu_percent(interval=1)
-            memory = psutil.virtual_memory()
-            disk = psutil.disk_usage('/')
+            snapshot = self._get_snapshot()
+            cpu_percent = snapshot.cpu_percent
+            memory = snapshot.memory
+            disk = snapshot.disk
             
-            return jsonify({
+            return json_response({
                 "names": [
                     "system.cpu.usage",
                     "system.memory.usage",
@@ -177,41 +389,49 @@ class FlaskActuator:
                 }
             })
         except Exception as e:
-            return jsonify({"error": str(e)}), 500
+            return json_response({"error": str(e)}, status=500)
     
-    def env(self):
-        """Environment variables (filtered for security)"""
+    def _build_env(self):
+        """Snapshot the environment, filtering out anything that looks like a secret"""
         safe_env_vars = {
             k: v for k, v in os.environ.items() 
-            if not any(secret in k.lower() for secret in ['password', 'secret', 'key', 'token', 'credential', 'auth'])
+            if not SECRET_RE.search(k)
         }
         
-        return jsonify({
-            "activeProfiles": [os.getenv('ENVIRONMENT', 'development')],
+        return {
+            "activeProfiles": [self._environment],
             "propertySources": [
                 {
                     "name": "systemEnvironment",
                     "properties": {k: {"value": v} for k, v in safe_env_vars.items()}
                 }
             ]
-        })
+        }
     
-    def configprops(self):
-        """Configuration properties"""
-        return jsonify({
+    def env(self):
+        """Environment variables (filtered for security)"""
+        return cached_json_response(self._env_body, self._env_etag)
+    
+    def _build_configprops(self):
+        """Build the configuration properties payload"""
+        return {
             "contexts": {
                 "application": {
                     "beans": {
                         "flask-config": {
                             "prefix": "flask",
                             "properties": {
-                                "debug": os.getenv('FLASK_DEBUG', 'False'),
-                                "testing": os.getenv('FLASK_TESTING', 'False'),
-                                "port": os.getenv('PORT', '8080'),
-                                "host": os.getenv('HOST', '0.0.0.0')
+                                "debug": self._flask_debug,
+                                "testing": self._flask_testing,
+                                "port": self._port,
+                                "host": self._host
                             }
                         }
                     }
                 }
             }
-        })
+        }
+    
+    def configprops(self):
+        """Configuration properties"""
+        return cached_json_response(self._configprops_body, self._configprops_etag)
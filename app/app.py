@@ -1,10 +1,15 @@
-from flask import Flask, jsonify
+import orjson
+from flask import Flask, Response
 import subprocess
 import os
 import sys
 import platform
 from datetime import datetime
 
+# Shared by every /healthz request; Flask passes it through untouched as long
+# as nothing (e.g. an after_request hook) mutates it
+_HEALTHZ_RESP = Response(b'{"status":"ok"}', status=200, mimetype='application/json')
+
 def get_git_commit_hash():
     """Get the current Git commit hash"""
     # First try to get from environment variable (set during build)
@@ -43,6 +48,8 @@ def get_git_commit_hash():
     
     return "unknown"
 
+GIT_COMMIT_HASH = get_git_commit_hash()
+
 def get_kubernetes_namespace():
     """Get the Kubernetes namespace from the pod's service account"""
     try:
@@ -57,6 +64,34 @@ def get_kubernetes_namespace():
     # Fallback to environment variable or default
     return os.getenv('KUBERNETES_NAMESPACE', os.getenv('ENVIRONMENT', 'development'))
 
+KUBERNETES_NAMESPACE = get_kubernetes_namespace()
+
+def get_debug_info():
+    """Collect the environment details used to troubleshoot commit hash issues"""
+    debug_info = {
+        "git_commit_hash_env": os.getenv('GIT_COMMIT_HASH', 'Not set'),
+        "build_time_env": os.getenv('BUILD_TIME', 'Not set'),
+        "git_branch_env": os.getenv('GIT_BRANCH', 'Not set'),
+        "environment": KUBERNETES_NAMESPACE,
+        "current_directory": os.getcwd(),
+        "app_directory": os.path.dirname(__file__),
+        "commit_file_exists": os.path.exists(os.path.join(os.path.dirname(__file__), 'commit.txt')),
+        "git_directory_exists": os.path.exists(os.path.join(os.path.dirname(__file__), '.git')),
+        "parent_git_exists": os.path.exists(os.path.join(os.path.dirname(os.path.dirname(__file__)), '.git')),
+        "computed_commit_hash": GIT_COMMIT_HASH
+    }
+    
+    # Try to read commit file content
+    try:
+        commit_file = os.path.join(os.path.dirname(__file__), 'commit.txt')
+        if os.path.exists(commit_file):
+            with open(commit_file, 'r') as f:
+                debug_info["commit_file_content"] = f.read().strip()
+    except Exception as e:
+        debug_info["commit_file_error"] = str(e)
+    
+    return debug_info
+
 def create_app():
     app = Flask(__name__)
     
@@ -73,47 +108,20 @@ def create_app():
     @app.route("/healthz")
     def healthz():
         """Kubernetes-style health check"""
-        return jsonify(status="ok"), 200
+        return _HEALTHZ_RESP
+
+    debug_body = orjson.dumps(get_debug_info())
 
     @app.route("/debug")
     def debug():
         """Debug endpoint to troubleshoot commit hash issues"""
-        debug_info = {
-            "git_commit_hash_env": os.getenv('GIT_COMMIT_HASH', 'Not set'),
-            "build_time_env": os.getenv('BUILD_TIME', 'Not set'),
-            "git_branch_env": os.getenv('GIT_BRANCH', 'Not set'),
-            "environment": get_kubernetes_namespace(),
-            "current_directory": os.getcwd(),
-            "app_directory": os.path.dirname(__file__),
-            "commit_file_exists": os.path.exists(os.path.join(os.path.dirname(__file__), 'commit.txt')),
-            "git_directory_exists": os.path.exists(os.path.join(os.path.dirname(__file__), '.git')),
-            "parent_git_exists": os.path.exists(os.path.join(os.path.dirname(os.path.dirname(__file__)), '.git')),
-            "computed_commit_hash": get_git_commit_hash()
-        }
-        
-        # Try to read commit file content
-        try:
-            commit_file = os.path.join(os.path.dirname(__file__), 'commit.txt')
-            if os.path.exists(commit_file):
-                with open(commit_file, 'r') as f:
-                    debug_info["commit_file_content"] = f.read().strip()
-        except Exception as e:
-            debug_info["commit_file_error"] = str(e)
-        
-        return jsonify(debug_info), 200
+        return Response(debug_body, status=200, mimetype='application/json')
+
+    home_body = f"Hello from Flask! | Environment: {KUBERNETES_NAMESPACE} | Commit: {GIT_COMMIT_HASH}".encode()
 
     @app.route("/")
     def home():
-        commit_hash = get_git_commit_hash()
-        environment = get_kubernetes_namespace()
-        
-        # Debug information
-        print(f"Debug - Commit hash: {commit_hash}")
-        print(f"Debug - Environment: {environment}")
-        print(f"Debug - GIT_COMMIT_HASH env var: {os.getenv('GIT_COMMIT_HASH', 'Not set')}")
-        
-        message = f"Hello from Flask! | Environment: {environment} | Commit: {commit_hash}"
-        return message, 200
+        return Response(home_body, status=200, mimetype='text/plain')
 
     return app
 
@@ -0,0 +1,23 @@
+"""
+Shared helpers for building HTTP responses
+"""
+import hashlib
+import orjson
+from flask import Response, request
+
+def json_response(payload, status=200):
+    """Serialize payload with orjson and wrap it in a JSON Response"""
+    return Response(orjson.dumps(payload), status=status, mimetype='application/json')
+
+def etag_for(body):
+    """Compute a short ETag for a pre-serialized response body"""
+    return hashlib.blake2b(body, digest_size=8).hexdigest()
+
+def cached_json_response(body, etag):
+    """Return a pre-serialized JSON body, or an empty 304 if the client already has it"""
+    if request.if_none_match.contains_weak(etag):
+        response = Response(status=304)
+    else:
+        response = Response(body, mimetype='application/json')
+    response.set_etag(etag)
+    return response
@@ -4,7 +4,17 @@ workers = 2          # tune up on bigger CPUs
 threads = 4
 timeout = 60         # time for a *busy* request
 graceful_timeout = 30
-keepalive = 2        # don’t sit long on idle sockets
+keepalive = 30       # outlive probe/scrape intervals so they reuse connections
+preload_app = True   # env, git hash, namespace and static payloads don't change
+                     # after startup; build them once in the master, share via fork
 accesslog = "-"
 errorlog = "-"
 
+def post_fork(server, worker):
+    """Start the actuator sampler in each worker before it takes requests"""
+    # The master only takes one startup sample and never runs the sampler, so
+    # there is no thread to lose (or fork around) when workers are spawned
+    actuator = worker.app.wsgi().extensions.get('actuator')
+    if actuator is not None:
+        actuator.ensure_sampler()
+
@@ -0,0 +1,44 @@
+import psutil
+import pytest
+
+from app import actuator as actuator_module
+from app.actuator import MeminfoReader, MemoryUsage, read_disk_usage
+
+MEMINFO = (
+    b"MemTotal:        8000000 kB\n"
+    b"MemFree:         1000000 kB\n"
+    b"MemAvailable:    6000000 kB\n"
+    b"Buffers:           50000 kB\n"
+)
+
+def read_meminfo(tmp_path, content):
+    path = tmp_path / "meminfo"
+    path.write_bytes(content)
+    reader = MeminfoReader(str(path))
+    try:
+        return reader.read()
+    finally:
+        reader.close()
+
+def test_meminfo_reader_parses_fields(tmp_path):
+    assert read_meminfo(tmp_path, MEMINFO) == MemoryUsage(8000000 * 1024, 6000000 * 1024, 25.0)
+
+def test_meminfo_reader_grows_buffer(tmp_path):
+    padding = b"".join(b"Filler%04d:        1 kB\n" % i for i in range(300))
+    content = padding + MEMINFO
+    assert len(content) > 4096
+    assert read_meminfo(tmp_path, content) == MemoryUsage(8000000 * 1024, 6000000 * 1024, 25.0)
+
+def test_meminfo_reader_falls_back_without_memavailable(tmp_path, monkeypatch):
+    fallback = MemoryUsage(1, 2, 3.0)
+    monkeypatch.setattr(actuator_module, "psutil_memory_usage", lambda: fallback)
+    content = MEMINFO.replace(b"MemAvailable:", b"MemOther:")
+    assert read_meminfo(tmp_path, content) == fallback
+
+def test_read_disk_usage_matches_psutil():
+    ours = read_disk_usage('/')
+    theirs = psutil.disk_usage('/')
+    assert ours.total == theirs.total
+    # Other processes may write between the two calls
+    assert ours.used == pytest.approx(theirs.used, abs=64 * 1024 * 1024)
+    assert ours.free == pytest.approx(theirs.free, abs=64 * 1024 * 1024)
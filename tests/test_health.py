@@ -1,8 +1,160 @@
+import time
+from types import SimpleNamespace
+
+import pytest
+
+from app import actuator as actuator_module
 from app.app import create_app
 
-def test_health():
-    app = create_app()
+@pytest.fixture
+def make_app():
+    """Create apps for a test and stop their actuator samplers afterwards"""
+    apps = []
+    def factory():
+        app = create_app()
+        apps.append(app)
+        return app
+    yield factory
+    for app in apps:
+        app.extensions['actuator'].close()
+
+def test_health(make_app):
+    app = make_app()
+    client = app.test_client()
+    for _ in range(2):
+        resp = client.get("/healthz")
+        assert resp.status_code == 200
+        assert resp.get_json()["status"] == "ok"
+
+def test_actuator_health_is_cached(make_app, monkeypatch):
+    app = make_app()
+    actuator = app.extensions['actuator']
+    client = app.test_client()
+    
+    now = [1000.0]
+    monkeypatch.setattr(actuator_module, "time", SimpleNamespace(monotonic=lambda: now[0], time=time.time))
+    checks = []
+    check_health = actuator._check_health
+    def counting_check_health():
+        checks.append(now[0])
+        return check_health()
+    monkeypatch.setattr(actuator, "_check_health", counting_check_health)
+    
+    first = client.get("/actuator/health")
+    assert first.status_code in (200, 503)
+    assert first.get_json()["status"] in ("UP", "DOWN")
+    now[0] += actuator_module.HEALTH_CACHE_TTL / 2
+    assert client.get("/actuator/health").data == first.data
+    assert len(checks) == 1
+    
+    now[0] += actuator_module.HEALTH_CACHE_TTL
+    client.get("/actuator/health")
+    assert len(checks) == 2
+
+def test_actuator_metrics_does_not_block(make_app):
+    app = make_app()
     client = app.test_client()
-    resp = client.get("/healthz")
+    started = time.monotonic()
+    resp = client.get("/actuator/metrics")
+    # Sampling CPU inline (cpu_percent(interval=1)) would take a full second
+    assert time.monotonic() - started < 0.5
     assert resp.status_code == 200
-    assert resp.get_json()["status"] == "ok"
+    assert "system.cpu.usage" in resp.get_json()["measurements"]
+
+def test_actuator_info_reports_uptime(make_app):
+    app = make_app()
+    client = app.test_client()
+    resp = client.get("/actuator/info")
+    assert resp.status_code == 200
+    assert resp.get_json()["app"]["uptime"].endswith("s")
+
+def test_home(make_app):
+    app = make_app()
+    client = app.test_client()
+    resp = client.get("/")
+    assert resp.status_code == 200
+    assert resp.data.startswith(b"Hello from Flask! | Environment: ")
+
+def test_actuator_env_hides_secrets(make_app, monkeypatch):
+    monkeypatch.setenv("DB_PASSWORD", "hunter2")
+    monkeypatch.setenv("APP_NAME", "flask-web")
+    app = make_app()
+    client = app.test_client()
+    properties = client.get("/actuator/env").get_json()["propertySources"][0]["properties"]
+    assert "DB_PASSWORD" not in properties
+    assert properties["APP_NAME"] == {"value": "flask-web"}
+
+def test_actuator_index_and_configprops(make_app):
+    app = make_app()
+    client = app.test_client()
+    links = client.get("/actuator").get_json()["_links"]
+    assert links["configprops"]["href"] == "/actuator/configprops"
+    resp = client.get("/actuator/configprops")
+    assert resp.status_code == 200
+    assert "flask-config" in resp.get_json()["contexts"]["application"]["beans"]
+
+def test_actuator_env_honours_etag(make_app):
+    app = make_app()
+    client = app.test_client()
+    first = client.get("/actuator/env")
+    etag = first.headers["ETag"]
+    second = client.get("/actuator/env", headers={"If-None-Match": etag})
+    assert second.status_code == 304
+    assert second.data == b""
+
+def test_actuator_liveness_and_readiness(make_app):
+    app = make_app()
+    client = app.test_client()
+    liveness = client.get("/actuator/health/liveness")
+    assert liveness.status_code == 200
+    assert liveness.get_json() == {"status": "UP"}
+    readiness = client.get("/actuator/health/readiness")
+    assert readiness.data == client.get("/actuator/health").data
+
+def test_debug(make_app):
+    app = make_app()
+    client = app.test_client()
+    resp = client.get("/debug")
+    assert resp.status_code == 200
+    assert "computed_commit_hash" in resp.get_json()
+
+def test_actuator_close_stops_sampler(make_app):
+    actuator = make_app().extensions['actuator']
+    actuator.ensure_sampler()
+    thread = actuator._sampler_thread
+    assert thread.is_alive()
+    actuator.close()
+    assert not thread.is_alive()
+
+def test_health_and_metrics_share_snapshot(make_app):
+    app = make_app()
+    actuator = app.extensions['actuator']
+    actuator._snapshot = actuator_module.SystemSnapshot(
+        cpu_percent=12.5,
+        memory=actuator_module.MemoryUsage(total=8000, available=6000, percent=25.0),
+        disk=actuator_module.DiskUsage(total=1000, used=400, free=600),
+        error=None
+    )
+    actuator._health_cache = (0.0, None, None)
+    client = app.test_client()
+    
+    components = client.get("/actuator/health").get_json()["components"]
+    assert components["memory"]["details"] == {"total": 8000, "available": 6000, "percent": 25.0}
+    assert components["diskSpace"]["details"]["total"] == 1000
+    assert components["diskSpace"]["details"]["free"] == 600
+    
+    measurements = client.get("/actuator/metrics").get_json()["measurements"]
+    assert measurements["system.memory.total"]["value"] == 8000
+    assert measurements["system.memory.usage"]["value"] == 25.0
+    assert measurements["system.disk.total"]["value"] == 1000
+    assert measurements["system.disk.usage"]["value"] == 40.0
+    assert measurements["system.cpu.usage"]["value"] == 12.5
+
+def test_metrics_starts_sampler_without_fake_cpu(make_app):
+    app = make_app()
+    actuator = app.extensions['actuator']
+    assert actuator._sampler_thread is None
+    resp = app.test_client().get("/actuator/metrics")
+    # No CPU reading exists before the sampler's first tick
+    assert resp.get_json()["measurements"]["system.cpu.usage"]["value"] is None
+    assert actuator._sampler_thread.is_alive()